@@ -1,21 +1,54 @@
 #!/usr/bin/env python3
 """Examples of basic commands done using ExtendedSurface."""
-import random
-
-from PIL import ImageDraw
-from PIL import ImageFont
+import numpy
 
 from src.ExtendedSurface import ExtendedSurface
 
+# Random number generator used for everything random in this example.
+# Set the seed to an int to draw the same picture on every run.
+seed = None
+rng = numpy.random.default_rng(seed)
+
+# Column order that rearranges RGBA colors into cairo's BGRA pixel order
+RGBA_TO_BGRA = [2, 1, 0, 3]
+
 def random_rectangles(surface, num_rectangles):
 	"""Draw rectangles randomly all over the ExtendedSurface object."""
-	for _ in range(num_rectangles):
-		width = random.randint(0, surface.get_width()/2)
-		height = random.randint(0, surface.get_height()/2)
-		x = random.randint(0, surface.get_width() - width)
-		y = random.randint(0, surface.get_height() - height)
-		color = random.choices(range(256), k=4)
-		surface.draw.rectangle(x, y, width, height, color=color)
+	# Grab the surface dimensions once
+	surface_width = surface.get_width()
+	surface_height = surface.get_height()
+
+	# Generate the dimensions, positions, and colors of every rectangle from
+	# one block of random bytes: per rectangle, four bytes scale its width,
+	# height, x, and y into range, and four more are its RGBA color
+	random_bytes = numpy.frombuffer(
+		rng.bytes(num_rectangles * 8), dtype=numpy.uint8).reshape(-1, 8)
+	fractions = random_bytes[:, :4].astype(numpy.int64)
+	widths = fractions[:, 0]*(surface_width//2)//255
+	heights = fractions[:, 1]*(surface_height//2)//255
+	xs = fractions[:, 2]*(surface_width - widths)//255
+	ys = fractions[:, 3]*(surface_height - heights)//255
+	colors = random_bytes[:, 4:]
+
+	# Cairo stores pixels as premultiplied BGRA, so convert all the colors
+	# at once
+	opacities = colors[:, 3] / 255
+	sources = colors[:, RGBA_TO_BGRA] * opacities[:, None]
+	sources[:, 3] = colors[:, 3]
+
+	# Composite each rectangle directly onto the pixel buffer instead of
+	# building and filling a path for it
+	pixels = surface.get_pixel_array()
+	for x, y, width, height, source, opacity in zip(
+			xs.tolist(), ys.tolist(),
+			widths.tolist(), heights.tolist(),
+			sources, opacities.tolist()
+			):
+		region = pixels[y:y+height, x:x+width]
+		region[:] = source + region*(1 - opacity)
+
+	# Let cairo know the buffer was changed behind its back
+	surface.surface.mark_dirty()
 
 # Create an ExtendedSurface object, sized 600x800 pixels
 es = ExtendedSurface(600, 800)
@@ -48,17 +81,9 @@ es.paste(es2, "center", "center")
 # (outline, plus vertical/horizontal center lines)
 es.gridlines()
 
-# Convert it to a PIL object
-image = es.to_pil()
-
-# Write "Hello World" in black 25 pt font at (50, 50) using PIL commands
-draw = ImageDraw.Draw(image)
-font = ImageFont.truetype("fonts/arial.ttf", 25)
-draw.text((50, 50), "Hello World", (0, 0, 0), font=font)
-
-# Convert the image back to an ExtendedSurface object
-es.from_pil(image)
+# Write "Hello World" in black 25 pt font at (50, 50), straight onto the
+# surface with cairo (no round trip through PIL needed)
+es.text.write("Hello World", 50, 50, "arial.ttf", font_size=25)
 
 # Save the result as a PNG file and a PDF file
-es.write_to_png("example_basics.png")
-es.write_to_pdf("example_basics.pdf")
+es.write_to(["example_basics.png", "example_basics.pdf"])
@@ -1,9 +1,30 @@
 #!/usr/bin/env python3
 """Examples of various ways to draw a polygon."""
-import math
+import numpy
 
 from src.ExtendedSurface import ExtendedSurface
 
+def regular_polygon(x, y, radius, sides, phase=0, step=1):
+	"""
+	Return the vertices of a regular polygon as a (sides, 2) array.
+
+	Keyword arguments:
+		x (float) -- the x-coordinate of the polygon's center.
+		y (float) -- the y-coordinate of the polygon's center.
+		radius (float) -- the distance from the center to each vertex.
+		sides (int) -- the number of vertices.
+		phase (float) -- the angle of the first vertex, in radians
+			(default 0).
+		step (int) -- how many vertices to skip over to get to the next one,
+			e.g. 2 for a pentagram (default 1).
+	"""
+	indices = numpy.arange(0, sides*step, step) % sides
+	angles = phase + indices*(2*numpy.pi/sides)
+	vertices = numpy.empty((sides, 2))
+	vertices[:, 0] = x + radius*numpy.cos(angles)
+	vertices[:, 1] = y + radius*numpy.sin(angles)
+	return vertices
+
 # Create the ExtendedSurface object and set the background to white
 es = ExtendedSurface(600, 800)
 es.set_background()
@@ -22,13 +43,9 @@ es.draw.polygon(points=quadrilateral, fill=False, color=(0, 0, 255))
 
 # Draw a green pentagon with a red outline that is 10 pixels thick
 radius = 100
-angle = 72 #degrees
-pentagon = []
+phase = numpy.radians(-90)
 origin = (es.get_width()*1/4, es.get_height()*3/4)
-for i in range(5):
-	x = origin[0] + radius*math.cos(math.radians(-90 + i*angle))
-	y = origin[1] + radius*math.sin(math.radians(-90 + i*angle))
-	pentagon.append((x, y))
+pentagon = regular_polygon(*origin, radius, 5, phase)
 
 es.draw.polygon(
 	points=pentagon,
@@ -38,12 +55,8 @@ es.draw.polygon(
 	)
 
 # Draw a filled orange 5-pointed star with a black outline
-pentagram = []
 origin = (es.get_width()*3/4, es.get_height()*3/4)
-for i in range(0, 5*2, 2):
-	x = origin[0] + radius*math.cos(math.radians(-90 + (i%5)*angle))
-	y = origin[1] + radius*math.sin(math.radians(-90 + (i%5)*angle))
-	pentagram.append((x, y))
+pentagram = regular_polygon(*origin, radius, 5, phase, step=2)
 
 es.draw.polygon(points=pentagram, color=(255, 165, 0), outline_color=(0, 0, 0))
 
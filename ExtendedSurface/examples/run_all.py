@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""Run every example at once, each in its own process."""
+import concurrent.futures
+import os
+import pkgutil
+import runpy
+
+def run_example(module_name):
+	"""
+	Run an example module and return its name.
+
+	Keyword arguments:
+		module_name (str) -- the full name of the example module.
+	"""
+	runpy.run_module(module_name)
+	return module_name
+
+def main():
+	"""Render all of the examples in parallel."""
+	# Find every example module in this package
+	examples_dir = os.path.dirname(os.path.abspath(__file__))
+	module_names = sorted(
+		f"{__package__}.{module.name}"
+		for module in pkgutil.iter_modules([examples_dir])
+		if module.name.startswith("example_")
+		)
+
+	# The examples don't share any state, so run them in separate processes
+	# to render them on all cores at once
+	with concurrent.futures.ProcessPoolExecutor() as executor:
+		for module_name in executor.map(run_example, module_names):
+			print(f"Finished {module_name}")
+
+if __name__ == "__main__":
+	main()
@@ -5,10 +5,91 @@ This class extends existing pycairo drawing functionality and introduces
 some new functionality. The code is intended to be clean and accessible,
 producing vector drawings that are both predictable and complex.
 """
+import collections
+import contextlib
 import functools
 import math
+from math import pi, tau
 
 import cairo
+import numpy
+
+# The most shapes a batch will put into one path before drawing it
+MAX_BATCH_SIZE = 200
+
+# A quarter turn, in radians
+_HALF_PI = pi / 2
+
+# The start and end angles of the arc for each corner of a rounded
+# rectangle, in the order the corners are drawn
+_CORNER_ANGLES = (
+	(0.0, _HALF_PI),
+	(_HALF_PI, pi),
+	(pi, pi + _HALF_PI),
+	(pi + _HALF_PI, tau)
+	)
+
+# How to find the coordinate for each string an x- or y-coordinate can be
+# sent in as, given the size of the surface and of the polygon along that
+# axis, and half the thickness of the polygon's outline
+_X_ANCHORS = {
+	"left": lambda surface_width, width, half_outline: half_outline,
+	"center": lambda surface_width, width, half_outline:
+		(surface_width - width) / 2,
+	"right": lambda surface_width, width, half_outline:
+		surface_width - (width + half_outline)
+	}
+_Y_ANCHORS = {
+	"top": lambda surface_height, height, half_outline: half_outline,
+	"center": lambda surface_height, height, half_outline:
+		(surface_height - height) / 2,
+	"bottom": lambda surface_height, height, half_outline:
+		surface_height - (height + half_outline)
+	}
+
+# The most parsed coordinates a DrawSurface will remember
+_COORD_CACHE_SIZE = 1024
+
+# The largest width or height, in pixels, of a shape that gets cached as an
+# image. Bigger shapes are drawn straight onto the surface instead.
+_MAX_STAMP_SIZE = 64
+
+# The most shape images a DrawSurface will remember
+_STAMP_CACHE_SIZE = 256
+
+# The settings on the Context a DrawSurface keeps track of, so it can skip
+# setting them to what they already are
+_STATE_KEYS = ("color", "line_cap", "line_join", "line_width")
+
+# The attributes a shape is drawn with when they aren't sent in. A shape's
+# outline color defaults to its color.
+_DEFAULTS = {
+	"color": (0, 0, 0),
+	"fill": True,
+	"line_cap": cairo.LINE_CAP_SQUARE,
+	"line_join": cairo.LINE_JOIN_MITER,
+	"outline": 1
+	}
+
+# The keyword arguments that make up how a shape looks
+_STYLE_KEYS = (
+	"color", "fill", "line_cap", "line_join",
+	"line_width", "outline", "outline_color"
+	)
+
+def _apply_outline_offset(points, half_outline):
+	"""
+	Return a new (N, 2) array of polygon vertices, shifted by half the
+	outline in both directions so the outline lands on the right pixels.
+
+	Keyword arguments:
+		points (list/numpy.ndarray) -- the xy-coordinates of the vertices.
+		half_outline (float) -- half the thickness of the outline.
+	"""
+	# Copy the points into a float array, then shift them in place
+	points = numpy.array(points, dtype=numpy.float64)
+	points += half_outline
+	return points
 
 def polygon_wrapper(func):
 	"""
@@ -24,8 +105,15 @@ def polygon_wrapper(func):
 		Setup the Context, draw the polygon with attributes applied, and
 		teardown the environment.
 		"""
-		# Save the Context so we can restore it when this is done
+		# Inside a batch, the polygon gets added to the batch's path instead
+		if self._batch_style is not None:
+			return self._add_to_batch(func, args, kwargs)
+
+		# Save the Context so we can restore it when this is done. It may
+		# have been changed since the last shape, so forget what settings
+		# it's known to have.
 		self.context.save()
+		self.invalidate_state_cache()
 
 		# Initialize the polygon's attributes
 		self.init_attributes(**kwargs)
@@ -33,16 +121,13 @@ def polygon_wrapper(func):
 		# Call the function
 		result = func(self, *args, **kwargs)
 
-		# Fill the polygon, if it's being filled
-		if self.fill:
-			self.context.fill_preserve()
+		# Fill and outline the polygon
+		self._fill_and_stroke()
 
-		# Set the outline color and outline the polygon
-		self.calling_surface.set_color(self.outline_color)
-		self.context.stroke()
-
-		# Restore the Context now that the polygon is drawn
+		# Restore the Context now that the polygon is drawn, which puts back
+		# the settings the polygon changed
 		self.context.restore()
+		self.invalidate_state_cache()
 
 		return result
 
@@ -50,6 +135,16 @@ def polygon_wrapper(func):
 
 class DrawSurface():
 	"""Draw a polygon on an ExtendedSurface object."""
+	# Every attribute a DrawSurface has, so they're stored in fixed slots
+	# instead of a dictionary per object
+	__slots__ = (
+		"calling_surface", "context",
+		"color", "fill", "line_cap", "line_join", "outline", "outline_color",
+		"_batch_style", "_group_style", "_group_size",
+		"_recording", "_recorded_paths",
+		"_coord_cache", "_shape_cache", "_ctx_state"
+		)
+
 	def __init__(self, calling_surface):
 		"""
 		Initialize the DrawSurface object.
@@ -76,7 +171,83 @@ class DrawSurface():
 		self.outline = None
 		self.outline_color = None
 
-	@polygon_wrapper
+		self._batch_style = None
+		self._group_style = None
+		self._group_size = 0
+
+		self._recording = False
+		self._recorded_paths = {}
+
+		self._coord_cache = {}
+		self._shape_cache = collections.OrderedDict()
+		self._ctx_state = dict.fromkeys(_STATE_KEYS)
+
+	@contextlib.contextmanager
+	def batch(self, **kwargs):
+		"""
+		Draw the shapes inside a with-block together, so that shapes with the
+		same attributes are filled and outlined all at once instead of one
+		at a time.
+
+		The attributes sent in apply to every shape in the batch, and a
+		shape's own attributes override them. Consecutive shapes that end up
+		with the same attributes share one path, up to MAX_BATCH_SIZE shapes
+		at a time. A path is filled with cairo's default winding rule, so
+		shapes traced in the same direction are filled once where they
+		overlap, but a shape traced in the opposite direction (e.g. a
+		counter-clockwise polygon) leaves a hole in the shapes under it.
+
+		For example:
+			with es.draw.batch(color=(255, 0, 0)):
+				for x in range(10, 600, 20):
+					es.draw.dot(x, 100, radius=5)
+
+		Keyword arguments:
+			color (3- or 4-tuple) -- the RGB(A) color of the shapes
+				(default (0, 0, 0) (black)).
+			fill (bool) -- whether or not to fill the shapes with color
+				(default True).
+			line_cap (cairo.LINE_CAP) -- the cap at the end of a line
+				(default cairo.LINE_CAP_SQUARE).
+			line_join(cairo.LINE_JOIN) -- the rendering between two
+				joining lines (default cairo.LINE_JOIN_MITER).
+			outline (int) -- the thickness of the shapes' outline,
+				in pixels (default 1).
+			outline_color (3- or 4-tuple) -- the RGB(A) color of the
+				shapes' outline (default 'color').
+		"""
+		# Save the Context so we can restore it when the batch is done
+		self.context.save()
+		self.invalidate_state_cache()
+
+		# A batch can be inside a recording or another batch, whose
+		# attributes this batch's are added to, so remember them to go back
+		# to afterwards
+		outer_style = self._batch_style
+		if outer_style is not None:
+			kwargs = {**outer_style, **kwargs}
+
+		self._batch_style = kwargs
+		try:
+			yield self
+		finally:
+			# Draw whatever's left in the batch
+			self._flush_batch()
+			self._batch_style = outer_style
+
+			# Restore the Context now that the batch is drawn
+			self.context.restore()
+			self.invalidate_state_cache()
+
+	def clear_cache(self):
+		"""
+		Forget the coordinates worked out for strings like "center", and the
+		paths recorded with record_path(), since those may have been placed
+		using them. Call this if the surface being drawn onto changes size.
+		"""
+		self._coord_cache.clear()
+		self._recorded_paths.clear()
+
 	def dot(self, x, y, radius=1, **kwargs):
 		"""
 		Draw a dot of a given radius, centered at (x, y).
@@ -94,21 +265,72 @@ class DrawSurface():
 			outline_color (3- or 4-tuple) -- the RGB(A) color of the
 				dot's outline (default 'color').
 		"""
-		# Calculate the width and height of the inner section of the dot
-		width = radius * 2 - self.outline
-		height = radius * 2 - self.outline
+		# Inside a batch, the dot has to be traced into the batch's path
+		if self._batch_style is not None:
+			return self._draw_dot(x, y, radius, **kwargs)
 
-		# Parse the x- and y-coordinates if they were sent in as strings.
-		# The parsing methods return the top-left corner of the bounding box,
-		# so we have to move the coordinates back to the center of the dot.
-		if isinstance(x, str):
-			x = self._parse_x(x, width) + width/2
-		if isinstance(y, str):
-			y = self._parse_y(y, height) + height/2
+		# Work out the dot's attributes and where its center is
+		self._read_attributes(**kwargs)
+		x, y = self._dot_center(x, y, radius)
 
-		# Draw the dot by moving to the center and drawing a circle with the
-		# given radius, accounting for the width of the outline.
-		self.context.arc(x, y, radius - self.outline/2, 0, 2 * math.pi)
+		# Paste the dot from an image, so a dot that's been drawn before
+		# doesn't need to be traced and filled again
+		margin = math.ceil(radius + self.outline) + 1
+		self._paint_stamp(
+			("dot", radius), x, y, margin, 2*margin, 2*margin,
+			lambda surface, x, y:
+				surface.draw._draw_dot(x, y, radius, **kwargs)
+			)
+
+	@polygon_wrapper
+	def dots(self, xs, ys, radius=1, **kwargs):
+		"""
+		Draw many dots with the same attributes at once, each centered at
+		(x, y). A single value can be sent in for any of the parameters, in
+		which case it's used for every dot.
+
+		The dots are drawn as one shape, so anywhere they overlap is only
+		filled once.
+
+		Keyword arguments:
+			xs (list/numpy.ndarray/int/str) -- the x-coordinates. Each one
+				can be either a number, or one of "left", "center", or "right".
+			ys (list/numpy.ndarray/int/str) -- the y-coordinates. Each one
+				can be either a number, or one of "top", "center", or "bottom".
+			radius (list/numpy.ndarray/int) -- the radii of the dots
+				(default 1).
+			color (3- or 4-tuple) -- the RGB(A) color of the dots
+				(default (0, 0, 0) (black)).
+			fill (bool) -- whether or not to fill the dots with color
+				(default True).
+			outline (int) -- the thickness of the dots' outline,
+				in pixels (default 1).
+			outline_color (3- or 4-tuple) -- the RGB(A) color of the
+				dots' outline (default 'color').
+		"""
+		# Parse all of the centers at once. Numbers are already the centers,
+		# and a string puts the edge of a dot against the edge of the
+		# surface, so its center is one radius in from there.
+		radii = numpy.asarray(radius, dtype=numpy.float64)
+		xs = self._parse_batch(
+			xs, 0, radii, self.calling_surface.get_width(), _X_ANCHORS, "xs",
+			offset=0)
+		ys = self._parse_batch(
+			ys, 0, radii, self.calling_surface.get_height(), _Y_ANCHORS, "ys",
+			offset=0)
+
+		# Account for the width of the outline, and stretch any single
+		# values out to one per dot. If every value was single, there's
+		# still one dot, so the arrays can't have zero dimensions.
+		xs, ys, radii = numpy.atleast_1d(
+			*numpy.broadcast_arrays(xs, ys, radii - self.outline/2))
+
+		# Draw each dot as its own circle in the path
+		new_sub_path = self.context.new_sub_path
+		arc = self.context.arc
+		for x, y, radius in zip(xs.tolist(), ys.tolist(), radii.tolist()):
+			new_sub_path()
+			arc(x, y, radius, 0, tau)
 
 	@polygon_wrapper
 	def ellipse(self, x, y, width, height, **kwargs):
@@ -134,13 +356,13 @@ class DrawSurface():
 		# Determine the x and y coordinates based on other attributes
 		x, y, width, height = self._adjust_params(x, y, width, height)
 
-		# Draw an ellipse by scaling the Context by the width and height,
-		# and drawing a unit circle
+		# Draw an ellipse by moving the Context to the center and scaling it
+		# by the width and height in one transform, and drawing a unit circle
 		self.context.save()
-		self.context.translate(
-			x + width / 2, y + height / 2)
-		self.context.scale(width / 2, height / 2)
-		self.context.arc(0, 0, 1, 0, 2 * math.pi)
+		self.context.transform(cairo.Matrix(
+			xx=width / 2, yy=height / 2,
+			x0=x + width / 2, y0=y + height / 2))
+		self.context.arc(0, 0, 1, 0, tau)
 		self.context.restore()
 
 	def line(self, x1, y1, x2, y2, **kwargs):
@@ -158,29 +380,46 @@ class DrawSurface():
 				(default cairo.LINE_CAP_SQUARE).
 			line_width (int) -- the thickness of the line, in pixels.
 		"""
-		# Save the Context so we can restore it after the line is drawn
-		self.context.save()
+		# Lines are stroked on their own, so draw anything that's been batched
+		# up first. The batch's attributes still apply to the line.
+		if self._batch_style is not None:
+			self._flush_batch()
+			kwargs = {**self._batch_style, **kwargs}
 
-		# Initialize the shape's attributes
-		self.init_attributes(**kwargs)
+		# A line being recorded is only traced into the path, so it only
+		# needs its attributes read in to know where it goes. Setting them
+		# would set the color on the surface's own Context.
+		if self._recording:
+			self._read_attributes(**kwargs)
+		else:
+			# Save the Context so we can restore it after the line is drawn
+			self.context.save()
+			self.invalidate_state_cache()
 
-		# Establish parameters not sent in. In this case we don't need these
-		# affecting anything, so we're setting them all to 0.
-		width = 0
-		height = 0
-		self.outline = 0
+			# Initialize the shape's attributes
+			self.init_attributes(**kwargs)
 
-		# Parse the x and y coordinates, if need be
-		x1, y1 = self._adjust_params(x1, y1, width, height)[0:2]
-		x2, y2 = self._adjust_params(x2, y2, width, height)[0:2]
+		# Parse the x and y coordinates, if need be. The ends of a line aren't
+		# moved to account for its width, so parse them as if it had none.
+		line_width = self.outline
+		self.outline = 0
+		x1 = self._parse_x(x1)
+		y1 = self._parse_y(y1)
+		x2 = self._parse_x(x2)
+		y2 = self._parse_y(y2)
+		self.outline = line_width
 
-		# Draw the line
-		self.context.move_to(x1, y1)
-		self.context.line_to(x2, y2)
-		self.context.stroke()
+		# Draw the line, unless it's being recorded, in which case it's left
+		# in the path
+		context = self.context
+		context.move_to(x1, y1)
+		context.line_to(x2, y2)
+		if not self._recording:
+			context.stroke()
 
-		# Restore the Context
-		self.context.restore()
+			# Restore the Context
+			context.restore()
+			self.invalidate_state_cache()
 
 	@polygon_wrapper
 	def polygon(self, points, **kwargs):
@@ -188,8 +427,9 @@ class DrawSurface():
 		Draw a polygon that connects a series of (x, y)-coordinates.
 
 		Keyword arguments:
-			points (list) -- a list of xy-coordinates as tuples,
-				indicating the vertices of the polygon.
+			points (list/numpy.ndarray) -- a list of xy-coordinates as
+				tuples, or an (N, 2) array of numbers, indicating the
+				vertices of the polygon.
 			color (3- or 4-tuple) -- the RGB(A) color of the polygon
 				(default (0, 0, 0) (black)).
 			fill (bool) -- whether or not to fill the polygon with color
@@ -201,16 +441,78 @@ class DrawSurface():
 			outline_color (3- or 4-tuple) -- the RGB(A) color of the
 				polygon's outline (default 'color').
 		"""
-		# Parse each set of points
-		for i, (x, y) in enumerate(points):
-			points[i] = (self._parse_x(x, 0), self._parse_y(y, 0))
+		# If the points are all numbers, they can all be adjusted for the
+		# outline at once. Otherwise, parse each set of points, since some of
+		# the coordinates are strings.
+		if isinstance(points, numpy.ndarray) or not any(
+				isinstance(coord, str) for point in points for coord in point):
+			points = _apply_outline_offset(points, self.outline/2).tolist()
+		else:
+			points = [(self._parse_x(x, 0), self._parse_y(y, 0))
+					  for x, y in points]
 
-		# Trace a line for each edge of the shape
-		self.context.move_to(points[0][0], points[0][1])
-		for x, y in points[1:]:
-			self.context.line_to(x, y)
+		# Trace a line for each edge of the shape. line_to is looked up once,
+		# and the points are walked with an iterator instead of a sliced copy.
+		points = iter(points)
+		self.context.move_to(*next(points))
+		line_to = self.context.line_to
+		for x, y in points:
+			line_to(x, y)
 		self.context.close_path()
 
+	def rebind(self, calling_surface):
+		"""
+		Point the DrawSurface at a surface whose ImageSurface has been
+		replaced, e.g. by cropping it. Anything worked out from the old
+		surface's size or Context is forgotten, but the shapes cached as
+		images are kept.
+
+		Keyword arguments:
+			calling_surface (ExtendedSurface) -- the surface to be drawn onto.
+		"""
+		self.calling_surface = calling_surface
+		self.context = calling_surface.context
+		self.clear_cache()
+		self.invalidate_state_cache()
+
+	@contextlib.contextmanager
+	def record_path(self, name):
+		"""
+		Record the shapes drawn inside a with-block as one path, instead of
+		drawing them, so the whole path can be drawn later with
+		replay_path() as many times as needed without tracing each shape
+		again.
+
+		Only where the shapes go is recorded, not how they look, so shapes
+		should be recorded with the outline they'll be drawn with.
+
+		For example:
+			with es.draw.record_path("grid"):
+				for x in range(0, 600, 20):
+					es.draw.line(x, 0, x, "bottom")
+			es.draw.replay_path("grid", fill=False, color=(128, 128, 128))
+
+		Keyword arguments:
+			name (str) -- the name to record the path as.
+		"""
+		assert self._batch_style is None, \
+			"Paths can't be recorded inside a batch or another recording"
+
+		# Trace the shapes onto a throwaway Context instead of the surface
+		context = self.context
+		self.context = cairo.Context(
+			cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, None))
+		self._batch_style = {}
+		self._recording = True
+		try:
+			yield self
+			self._recorded_paths[name] = self.context.copy_path()
+		finally:
+			self.context = context
+			self._batch_style = None
+			self._recording = False
+			self.invalidate_state_cache()
+
 	@polygon_wrapper
 	def rectangle(self, x, y, width, height, **kwargs):
 		"""
@@ -238,6 +540,63 @@ class DrawSurface():
 		self.context.rectangle(x, y, width, height)
 
 	@polygon_wrapper
+	def rectangles(self, xs, ys, widths, heights, **kwargs):
+		"""
+		Draw many rectangles with the same attributes at once. The
+		(x, y)-coordinates correspond to the top-left corner of each
+		rectangle. A single value can be sent in for any of the parameters,
+		in which case it's used for every rectangle.
+
+		The rectangles are drawn as one shape, so anywhere they overlap is
+		only filled once.
+
+		Keyword arguments:
+			xs (list/numpy.ndarray/int/str) -- the x-coordinates. Each one
+				can be either a number, or one of "left", "center", or "right".
+			ys (list/numpy.ndarray/int/str) -- the y-coordinates. Each one
+				can be either a number, or one of "top", "center", or "bottom".
+			widths (list/numpy.ndarray/int) -- the widths of the rectangles.
+			heights (list/numpy.ndarray/int) -- the heights of the rectangles.
+			color (3- or 4-tuple) -- the RGB(A) color of the rectangles
+				(default (0, 0, 0) (black)).
+			fill (bool) -- whether or not to fill the rectangles with color
+				(default True).
+			outline (int) -- the thickness of the rectangles' outline,
+				in pixels (default 1).
+			outline_color (3- or 4-tuple) -- the RGB(A) color of the
+				rectangles' outline (default 'color').
+		"""
+		# Parse and adjust all of the parameters sent in at once
+		xs, ys, widths, heights = self._adjust_params_batch(
+			xs, ys, widths, heights)
+
+		# Draw the rectangles
+		rectangle = self.context.rectangle
+		for x, y, width, height in zip(
+				xs.tolist(), ys.tolist(), widths.tolist(), heights.tolist()):
+			rectangle(x, y, width, height)
+
+	@polygon_wrapper
+	def replay_path(self, name, **kwargs):
+		"""
+		Draw a path recorded with record_path().
+
+		Keyword arguments:
+			name (str) -- the name the path was recorded as.
+			color (3- or 4-tuple) -- the RGB(A) color of the path
+				(default (0, 0, 0) (black)).
+			fill (bool) -- whether or not to fill the path with color
+				(default True).
+			outline (int) -- the thickness of the path's outline,
+				in pixels (default 1).
+			outline_color (3- or 4-tuple) -- the RGB(A) color of the
+				path's outline (default 'color').
+		"""
+		assert name in self._recorded_paths, \
+			f"No path has been recorded as '{name}'"
+
+		self.context.append_path(self._recorded_paths[name])
+
 	def rounded_rectangle(self, x, y, width, height, radius, **kwargs):
 		"""
 		Draw a rectangle with rounded corners. The (x, y)-coordinates
@@ -259,32 +618,67 @@ class DrawSurface():
 			outline_color (3- or 4-tuple) -- the RGB(A) color of the
 				rounded rectangle's outline (default 'color').
 		"""
-		# Parse and adjust the parameters sent in
-		x, y, width, height = self._adjust_params(x, y, width, height)
+		# Inside a batch, the rounded rectangle has to be traced into the
+		# batch's path
+		if self._batch_style is not None:
+			return self._draw_rounded_rectangle(
+				x, y, width, height, radius, **kwargs)
 
-		# (x, y)-coordinates of the four corners.
-		# The four corners are: bottom-right, bottom-left, top-left, top-right.
-		# This order is due to the origin and direction that pycairo goes in
-		# when it draws an arc (starts at the rightmost point of the circle and
-		# moves clockwise).
-		corners = [
-			[x + width - radius, y + height - radius],
-			[x + radius, y + height - radius],
-			[x + radius, y + radius],
-			[x + width - radius, y + radius]
-			]
+		# Work out the rounded rectangle's attributes and where its top-left
+		# corner is, as a number that _adjust_params will land in the same
+		# place when it's drawn
+		self._read_attributes(**kwargs)
+		x, y = self._adjust_params(x, y, width, height)[0:2]
+		x -= self.outline/2
+		y -= self.outline/2
 
-		# Draw the four corners
-		for i, (corner_x, corner_y) in enumerate(corners):
-			self.context.arc(
-				corner_x, corner_y,
-				radius,
-				(i%4)*(math.pi/2),
-				((i+1)%4)*(math.pi/2)
-				)
+		# Paste the rounded rectangle from an image, so one that's been drawn
+		# before doesn't need to be traced and filled again
+		margin = math.ceil(self.outline) + 1
+		self._paint_stamp(
+			("rounded_rectangle", width, height, radius), x, y, margin,
+			math.ceil(width) + 2*margin, math.ceil(height) + 2*margin,
+			lambda surface, x, y: surface.draw._draw_rounded_rectangle(
+				x, y, width, height, radius, **kwargs)
+			)
 
-		# Draw the path connecting them together
-		self.context.close_path()
+	def _add_to_batch(self, func, args, kwargs):
+		"""
+		Add a polygon to the current batch, drawing what's already in the
+		batch first if the polygon can't share its path. Return whatever
+		the polygon's function returns.
+
+		Keyword arguments:
+			func (function) -- the function to draw the polygon.
+			args (tuple) -- the positional arguments for the function.
+			kwargs (dict) -- the keyword arguments for the function.
+		"""
+		# Combine the batch's attributes with the polygon's own
+		style = dict(self._batch_style)
+		style.update(
+			(key, kwargs[key]) for key in _STYLE_KEYS if key in kwargs)
+
+		# A polygon being recorded is only traced into the path, so it only
+		# needs its attributes read in to know where it goes
+		if self._recording:
+			self._read_attributes(**style)
+			self.context.new_sub_path()
+			return func(self, *args, **kwargs)
+
+		# Polygons with different attributes can't share a path, and a path
+		# that gets too big slows cairo down, so start a new one if needed
+		if style != self._group_style or self._group_size >= MAX_BATCH_SIZE:
+			self._flush_batch()
+			self.init_attributes(**style)
+			self._group_style = style
+
+		# Start the polygon on its own sub-path, so it isn't connected to
+		# the previous one, and add it to the path
+		self.context.new_sub_path()
+		result = func(self, *args, **kwargs)
+		self._group_size += 1
+
+		return result
 
 	def _adjust_params(self, x, y, width, height):
 		"""
@@ -309,6 +703,151 @@ class DrawSurface():
 		# Return the adjusted x, y, width, and height
 		return x, y, width, height
 
+	def _adjust_params_batch(self, xs, ys, widths, heights):
+		"""
+		Return arrays of the adjusted x, y, width, and height of many objects
+		being drawn, the same way _adjust_params() does for one object.
+
+		Keyword arguments:
+			xs (list/numpy.ndarray/int/str) -- the x-coordinates sent in.
+			ys (list/numpy.ndarray/int/str) -- the y-coordinates sent in.
+			widths (list/numpy.ndarray/int) -- the widths sent in.
+			heights (list/numpy.ndarray/int) -- the heights sent in.
+		"""
+		# Adjust the widths and heights to account for half the outline
+		# on both sides of the polygons (so a full outline in total)
+		widths = numpy.asarray(widths, dtype=numpy.float64) - self.outline
+		heights = numpy.asarray(heights, dtype=numpy.float64) - self.outline
+
+		# Parse the x- and y-coordinates
+		half_outline = self.outline/2
+		xs = self._parse_batch(
+			xs, widths, half_outline,
+			self.calling_surface.get_width(), _X_ANCHORS, "xs")
+		ys = self._parse_batch(
+			ys, heights, half_outline,
+			self.calling_surface.get_height(), _Y_ANCHORS, "ys")
+
+		# Return the adjusted parameters, with any single values stretched
+		# out to one per object. If every value was single, there's still
+		# one object, so the arrays can't have zero dimensions.
+		return numpy.atleast_1d(
+			*numpy.broadcast_arrays(xs, ys, widths, heights))
+
+	def _dot_center(self, x, y, radius):
+		"""
+		Return the (x, y)-coordinates of the center of a dot, parsing them if
+		they were sent in as strings.
+
+		Keyword arguments:
+			x (int/str) -- the x-coordinate.
+			y (int/str) -- the y-coordinate.
+			radius (int) -- the radius of the dot.
+		"""
+		# Calculate the width and height of the inner section of the dot
+		width = radius * 2 - self.outline
+		height = radius * 2 - self.outline
+
+		# Parse the x- and y-coordinates if they were sent in as strings.
+		# The parsing methods return the top-left corner of the bounding box,
+		# so we have to move the coordinates back to the center of the dot.
+		if isinstance(x, str):
+			x = self._parse_x(x, width) + width/2
+		if isinstance(y, str):
+			y = self._parse_y(y, height) + height/2
+
+		return x, y
+
+	@polygon_wrapper
+	def _draw_dot(self, x, y, radius=1, **kwargs):
+		"""
+		Trace and draw a dot straight onto the surface. Takes the same
+		arguments as dot().
+		"""
+		x, y = self._dot_center(x, y, radius)
+
+		# Draw the dot by moving to the center and drawing a circle with the
+		# given radius, accounting for the width of the outline.
+		self.context.arc(x, y, radius - self.outline/2, 0, tau)
+
+	@polygon_wrapper
+	def _draw_rounded_rectangle(self, x, y, width, height, radius, **kwargs):
+		"""
+		Trace and draw a rounded rectangle straight onto the surface. Takes
+		the same arguments as rounded_rectangle().
+		"""
+		# Parse and adjust the parameters sent in
+		x, y, width, height = self._adjust_params(x, y, width, height)
+
+		# (x, y)-coordinates of the four corners.
+		# The four corners are: bottom-right, bottom-left, top-left, top-right.
+		# This order is due to the origin and direction that pycairo goes in
+		# when it draws an arc (starts at the rightmost point of the circle and
+		# moves clockwise).
+		corners = [
+			[x + width - radius, y + height - radius],
+			[x + radius, y + height - radius],
+			[x + radius, y + radius],
+			[x + width - radius, y + radius]
+			]
+
+		# Draw the four corners
+		for (corner_x, corner_y), (angle1, angle2) in zip(
+				corners, _CORNER_ANGLES):
+			self.context.arc(corner_x, corner_y, radius, angle1, angle2)
+
+		# Draw the path connecting them together
+		self.context.close_path()
+
+	def _fill_and_stroke(self):
+		"""Fill and outline the current path with the current attributes."""
+		# Filling or outlining with a fully transparent color wouldn't
+		# change anything, so skip it
+		context = self.context
+		color = self.color
+		outline_color = self.outline_color
+		needs_fill = self.fill and (len(color) < 4 or color[3] > 0)
+		needs_stroke = self.outline and (
+			len(outline_color) < 4 or outline_color[3] > 0)
+
+		# Without an outline, the path doesn't need to be kept after filling
+		if not needs_stroke:
+			if needs_fill:
+				context.fill()
+			else:
+				context.new_path()
+			return
+
+		# Fill the path, if it's being filled
+		if needs_fill:
+			context.fill_preserve()
+
+		# Set the outline color, if it isn't already the fill color, and
+		# outline the path
+		state = self._ctx_state
+		outline_color = tuple(outline_color)
+		if state["color"] != outline_color:
+			self.calling_surface.set_color(outline_color)
+			state["color"] = outline_color
+		context.stroke()
+
+	def _flush_batch(self):
+		"""Fill and outline the polygons gathered up in the current batch."""
+		if self._group_size > 0:
+			self._fill_and_stroke()
+
+		self._group_style = None
+		self._group_size = 0
+
+	def invalidate_state_cache(self):
+		"""
+		Forget the color and line settings the Context is known to have, so
+		the next shape sets all of them. Call this after changing the
+		Context directly between shapes in a batch, or between calls to
+		init_attributes().
+		"""
+		self._ctx_state = dict.fromkeys(_STATE_KEYS)
+
 	def init_attributes(self, **kwargs):
 		"""
 		Initialize the attributes for the polygon being drawn,
@@ -331,19 +870,176 @@ class DrawSurface():
 				polygon's outline (default 'color').
 		"""
 		# Initialize attributes based on keyword parameters
-		self.color = kwargs.get("color", (0, 0, 0))
-		self.fill = kwargs.get("fill", True)
-		self.line_cap = kwargs.get("line_cap", cairo.LINE_CAP_SQUARE)
-		self.line_join = kwargs.get("line_join", cairo.LINE_JOIN_MITER)
-		self.outline = kwargs.get("outline", 1)
-		self.outline_color = kwargs.get("outline_color", self.color)
-		self.outline = kwargs.get("line_width", self.outline)
-
-		# Update the Context based on the attributes sent in
-		self.calling_surface.set_color(self.color)
-		self.context.set_line_cap(self.line_cap)
-		self.context.set_line_join(self.line_join)
-		self.context.set_line_width(self.outline)
+		self._read_attributes(**kwargs)
+
+		# Update the Context based on the attributes sent in, skipping the
+		# settings it already has
+		context = self.context
+		state = self._ctx_state
+		color = tuple(self.color)
+		if state["color"] != color:
+			self.calling_surface.set_color(color)
+			state["color"] = color
+		if state["line_cap"] != self.line_cap:
+			context.set_line_cap(self.line_cap)
+			state["line_cap"] = self.line_cap
+		if state["line_join"] != self.line_join:
+			context.set_line_join(self.line_join)
+			state["line_join"] = self.line_join
+		if state["line_width"] != self.outline:
+			context.set_line_width(self.outline)
+			state["line_width"] = self.outline
+
+	def _paint_stamp(self, key, x, y, margin, width, height, draw):
+		"""
+		Paste an image of a shape onto the surface, drawing the image and
+		remembering it first if it hasn't been drawn before. Shapes too big
+		to be worth remembering, or that an image can't stand in for, are
+		drawn straight onto the surface.
+
+		The shape's attributes must already be read in.
+
+		Keyword arguments:
+			key (tuple) -- the type and size of the shape.
+			x (float) -- the x-coordinate the shape is drawn at.
+			y (float) -- the y-coordinate the shape is drawn at.
+			margin (int) -- how far past (x, y) the shape can reach up and
+				to the left, in pixels.
+			width (int) -- the width of the image the shape fits into.
+			height (int) -- the height of the image the shape fits into.
+			draw (function) -- draws the shape onto a given ExtendedSurface
+				at given (x, y)-coordinates.
+		"""
+		# Big shapes are quicker to draw than to keep around as images, and
+		# shapes that aren't on a whole or quarter pixel would rarely be
+		# drawn at the same fraction of a pixel twice, so both are drawn
+		# straight onto the surface. An image also only gives the same
+		# pixels as drawing the shape if it's painted over the surface
+		# without being scaled, rotated, or moved by part of a pixel, so the
+		# shape is drawn directly if the Context would do any of that.
+		context = self.context
+		matrix = context.get_matrix()
+		if (width > _MAX_STAMP_SIZE or height > _MAX_STAMP_SIZE
+				or not (float(x*4).is_integer() and float(y*4).is_integer())
+				or context.get_operator() != cairo.OPERATOR_OVER
+				or (matrix.xx, matrix.yx, matrix.xy, matrix.yy) != (1, 0, 0, 1)
+				or not (float(matrix.x0).is_integer()
+						and float(matrix.y0).is_integer())):
+			draw(self.calling_surface, x, y)
+			return
+
+		# Images only line up pixel for pixel when they're pasted at whole
+		# pixels, so the fraction of a pixel the shape is offset by is drawn
+		# into the image, and is part of what the image is remembered by
+		left = math.floor(x)
+		top = math.floor(y)
+		key += (
+			x - left, y - top, tuple(self.color), self.fill, self.line_cap,
+			self.line_join, self.outline, tuple(self.outline_color)
+			)
+
+		stamp = self._shape_cache.get(key)
+		if stamp is None:
+			# Draw the shape onto its own transparent surface
+			from .ExtendedSurface import ExtendedSurface
+			stamp_surface = ExtendedSurface(width, height)
+			draw(stamp_surface, margin + x - left, margin + y - top)
+			stamp = stamp_surface.surface
+
+			# Forget the least recently used image if the cache is full
+			if len(self._shape_cache) >= _STAMP_CACHE_SIZE:
+				self._shape_cache.popitem(last=False)
+			self._shape_cache[key] = stamp
+		else:
+			self._shape_cache.move_to_end(key)
+
+		# Paste the image so the shape lands where it would have been drawn
+		context.save()
+		context.set_source_surface(stamp, left - margin, top - margin)
+		context.paint()
+		context.restore()
+
+	def _parse_anchor(self, anchor, size, surface_size, anchors, name):
+		"""
+		Return the coordinate for a string like "center", remembering it in
+		case the same string comes up again for a polygon of the same size.
+
+		Keyword arguments:
+			anchor (str) -- the string the coordinate was sent in as.
+			size (int) -- the width or height of the polygon.
+			surface_size (int) -- the width or height of the surface.
+			anchors (dict) -- the strings allowed for this coordinate, and
+				how to calculate each one.
+			name (str) -- the name of the coordinate, for error messages.
+		"""
+		# Check if we've already worked this coordinate out
+		key = (anchor, size, surface_size, self.outline)
+		coord = self._coord_cache.get(key)
+		if coord is not None:
+			return coord
+
+		# Make sure the coordinate is in the correct format
+		assert anchor in anchors, \
+			(f"parameter '{name}' cannot be '{anchor}', must be either a "
+			 f"number or one of {', '.join(map(repr, anchors))}")
+
+		# Calculate the coordinate, adjusting for any potential outline
+		coord = anchors[anchor](surface_size, size, self.outline/2)
+
+		# Remember it, starting over if we're remembering too much
+		if len(self._coord_cache) >= _COORD_CACHE_SIZE:
+			self._coord_cache.clear()
+		self._coord_cache[key] = coord
+
+		return coord
+
+	@staticmethod
+	def _parse_batch(
+			coords, sizes, half_outline, surface_size, anchors, name,
+			offset=None):
+		"""
+		Parse an array of x- or y-coordinates, the same way _parse_x() and
+		_parse_y() parse a single one.
+
+		Keyword arguments:
+			coords (list/numpy.ndarray/int/str) -- the coordinates to parse.
+			sizes (numpy.ndarray) -- the widths or heights of the objects.
+			half_outline (float/numpy.ndarray) -- half the thickness of the
+				outline.
+			surface_size (int) -- the width or height of the surface.
+			anchors (dict) -- the strings allowed for these coordinates, and
+				how to calculate each one.
+			name (str) -- the name of the coordinates, for error messages.
+			offset (float) -- how far to move the coordinates sent in as
+				numbers (default 'half_outline').
+		"""
+		if offset is None:
+			offset = half_outline
+
+		# If there are only numbers, they just need to account for the outline
+		numbers = numpy.asarray(coords)
+		if numbers.dtype.kind in "iuf":
+			return numbers + offset
+
+		# Otherwise, find which coordinates are which strings
+		coords = numpy.array(coords, dtype=object)
+		at_anchors = [coords == anchor for anchor in anchors]
+		at_any = numpy.logical_or.reduce(at_anchors)
+
+		# Make sure the rest of the coordinates are numbers
+		for coord in coords[~at_any].tolist():
+			assert not isinstance(coord, str), \
+				(f"parameter '{name}' cannot be '{coord}', must be either a "
+				 f"number or one of {', '.join(map(repr, anchors))}")
+
+		# Parse the numbers and the strings, adjusting for the outline
+		numbers = numpy.where(at_any, 0, coords).astype(numpy.float64)
+		return numpy.select(
+			at_anchors,
+			[anchor(surface_size, sizes, half_outline)
+			 for anchor in anchors.values()],
+			numbers + offset
+			)
 
 	def _parse_x(self, x, width=0):
 		"""
@@ -353,23 +1049,12 @@ class DrawSurface():
 			x (int/str) -- the x-coordinate to parse.
 			width (int) -- the width of the polygon (default 0).
 		"""
-		# Make sure the coordinate is in the correct format
-		if isinstance(x, str):
-			assert x in ["left", "center", "right"], \
-				(f"parameter 'x' cannot be '{x}', must be either a number "
-				 "or one of 'left', 'center', or 'right'")
-
-		# Parse the x-coordinate, adjusting for any potential outline
-		if x == "left":
-			x = self.outline/2
-		elif x == "center":
-			x = (self.calling_surface.get_width() - width) / 2
-		elif x == "right":
-			x = (self.calling_surface.get_width() - (width + self.outline/2))
-		else:
-			x += self.outline/2
+		# Numbers only need to be adjusted for the outline
+		if not isinstance(x, str):
+			return x + self.outline/2
 
-		return x
+		return self._parse_anchor(
+			x, width, self.calling_surface.get_width(), _X_ANCHORS, "x")
 
 	def _parse_y(self, y, height=0):
 		"""
@@ -379,20 +1064,29 @@ class DrawSurface():
 			y (int/str) -- the y-coordinate to parse.
 			height (int) -- the height of the polygon (default 0).
 		"""
-		# Make sure the coordinate is in the correct format
-		if isinstance(y, str):
-			assert y in ["top", "center", "bottom"], \
-				(f"parameter 'y' cannot be '{y}', must be either a number "
-				 "or one of 'top', 'center', or 'bottom'")
-
-		# Parse the y-coordinate, adjusting for any potential outline
-		if y == "top":
-			y = self.outline/2
-		elif y == "center":
-			y = (self.calling_surface.get_height() - height) / 2
-		elif y == "bottom":
-			y = (self.calling_surface.get_height() - (height + self.outline/2))
+		# Numbers only need to be adjusted for the outline
+		if not isinstance(y, str):
+			return y + self.outline/2
+
+		return self._parse_anchor(
+			y, height, self.calling_surface.get_height(), _Y_ANCHORS, "y")
+
+	def _read_attributes(self, **kwargs):
+		"""
+		Initialize the attributes for the polygon being drawn, without
+		setting any of them on the Context. Takes the same arguments as
+		init_attributes().
+		"""
+		# Fill in the defaults for the attributes not sent in, all at once.
+		# Most shapes are drawn with the defaults, which need no filling in.
+		if kwargs:
+			attributes = {**_DEFAULTS, **kwargs}
 		else:
-			y += self.outline/2
+			attributes = _DEFAULTS
 
-		return y
+		self.color = attributes["color"]
+		self.fill = attributes["fill"]
+		self.line_cap = attributes["line_cap"]
+		self.line_join = attributes["line_join"]
+		self.outline = attributes.get("line_width", attributes["outline"])
+		self.outline_color = attributes.get("outline_color", self.color)
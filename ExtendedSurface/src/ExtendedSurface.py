@@ -2,6 +2,11 @@
 Extend the functionality of cairo.ImageSurface to allow for easier and
 cleaner vector drawing, text writing, and image manipulation.
 """
+import collections
+import functools
+import math
+import os
+
 import cairo
 import numpy
 
@@ -10,8 +15,98 @@ from PIL import Image
 from .DrawSurface import DrawSurface
 from .TextSurface import TextSurface
 
+# Multiplying by this turns a 0-255 color channel into cairo's 0-1 range
+_INV255 = 1 / 255
+
+# Where paste() puts an image for each string an x- or y-coordinate can be
+# sent in as, given the size of the surface and of the pasted image along
+# that axis
+_X_POS = {
+	"left": lambda surface_width, width: 0,
+	"center": lambda surface_width, width: (surface_width - width) / 2,
+	"right": lambda surface_width, width: surface_width - width
+	}
+_Y_POS = {
+	"top": lambda surface_height, height: 0,
+	"center": lambda surface_height, height: (surface_height - height) / 2,
+	"bottom": lambda surface_height, height: surface_height - height
+	}
+
+# Blank ImageSurfaces handed back by ExtendedSurface.release(), keyed by
+# format, width, and height, so the next ExtendedSurface of the same size
+# can reuse one instead of allocating its pixels again. The sizes used
+# least recently come first, so they're the first to be let go.
+_SURFACE_POOL = collections.OrderedDict()
+
+# The most surfaces the pool keeps, across every format and size
+_SURFACE_POOL_SIZE = 16
+
+def _acquire_surface(image_format, width, height):
+	"""
+	Return a blank ImageSurface of a given format and size, reusing one
+	from the pool if there is one.
+
+	Keyword arguments:
+		image_format (cairo.Format) -- the format of the image.
+		width (int) -- the width of the image, in pixels.
+		height (int) -- the height of the image, in pixels.
+	"""
+	key = (image_format, width, height)
+	pool = _SURFACE_POOL.get(key)
+	if not pool:
+		return cairo.ImageSurface(image_format, width, height)
+
+	# Take a surface out of the pool, dropping the size once it's empty
+	surface = pool.pop()
+	if pool:
+		_SURFACE_POOL.move_to_end(key)
+	else:
+		del _SURFACE_POOL[key]
+
+	# Wipe whatever was left on the surface, so it's as blank as a new one
+	context = cairo.Context(surface)
+	context.set_operator(cairo.OPERATOR_CLEAR)
+	context.paint()
+	return surface
+
+@functools.lru_cache(maxsize=32)
+def _gridlines_path(width, height, line_width):
+	"""
+	Return a cairo.Path with the outline and the vertical and horizontal
+	center lines of a surface. The path only depends on the surface size,
+	so it's built once and replayed on every call to gridlines().
+
+	Keyword arguments:
+		width (int) -- the width of the surface, in pixels.
+		height (int) -- the height of the surface, in pixels.
+		line_width (int) -- the width of the lines, in pixels.
+	"""
+	# Build the path on a throwaway Context, since a Path can be appended
+	# to any other Context afterwards
+	context = cairo.Context(
+		cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, None))
+
+	# Outline the surface, keeping the whole line inside it
+	context.rectangle(
+		line_width/2, line_width/2,
+		width - line_width, height - line_width
+		)
+
+	# Vertical and horizontal center lines
+	context.move_to(width/2, 0)
+	context.line_to(width/2, height)
+	context.move_to(0, height/2)
+	context.line_to(width, height/2)
+
+	return context.copy_path()
+
 class ExtendedSurface():
 	"""Extend the functionality of the cairo.ImageSurface class."""
+	# A quicker, lower quality filter for scaling pasted images, for when
+	# they're only being previewed. Exported images should keep the
+	# default, cairo.FILTER_GOOD.
+	FAST_PREVIEW = cairo.FILTER_FAST
+
 	def __init__(self, width, height, image_format=cairo.FORMAT_ARGB32):
 		"""
 		Initialize the ExtendedSurface object.
@@ -28,10 +123,53 @@ class ExtendedSurface():
 			text (TextSurface) -- the TextSurface object used to write text.
 			draw (DrawSurface) -- the DrawSurface object used to draw things.
 		"""
-		self.surface = cairo.ImageSurface(image_format, width, height)
+		self.surface = _acquire_surface(image_format, width, height)
 		self.context = cairo.Context(self.surface)
-		self.text = TextSurface(self)
-		self.draw = DrawSurface(self)
+		self._cache_dimensions()
+
+		# The buffer holding the pixels of a surface made by from_pil()
+		self._pixel_buf = None
+
+		# The TextSurface and DrawSurface are only made once they're used,
+		# since many surfaces are only ever pasted or cropped
+		self._text = None
+		self._draw = None
+
+	def _cache_dimensions(self):
+		"""
+		Remember the ImageSurface attribute's width, height, and format, so
+		they don't have to be asked of cairo every time. Call this whenever
+		the ImageSurface attribute is replaced.
+		"""
+		self._width = self.surface.get_width()
+		self._height = self.surface.get_height()
+		self._format = self.surface.get_format()
+
+	def clear(self, color=(0, 0, 0, 0)):
+		"""
+		Reset every pixel of the surface to a given color. Unlike
+		set_background(), the color replaces what's already there instead
+		of being drawn over it, so a surface can be reused for a new image
+		rather than allocating another one.
+
+		Keyword arguments:
+			color (3- or 4-tuple) -- the RGB(A) color to reset the surface to
+				(default (0, 0, 0, 0) (transparent)).
+		"""
+		# Draw any shapes still waiting in a batch, so they're cleared along
+		# with everything else
+		self._flush_batch()
+
+		# Save the state of our Context in order to restore it at the end
+		self.context.save()
+
+		# Paint the color over the whole surface, replacing every pixel
+		self.context.set_operator(cairo.OPERATOR_SOURCE)
+		self.set_color(color)
+		self.context.paint()
+
+		# Restore our Context back to its original state
+		self.context.restore()
 
 	def crop(self, x, y, width, height):
 		"""
@@ -44,9 +182,14 @@ class ExtendedSurface():
 			width (int/float) -- the width of the crop.
 			height (int/float) -- the height of the crop.
 		"""
-		# Make a new ImageSurface of the width and height given
-		cropped_surface = cairo.ImageSurface(
-			self.get_format(), int(width), int(height))
+		# Draw any shapes still waiting in a batch, so they're cropped along
+		# with everything else
+		self._flush_batch()
+
+		# Make a new ImageSurface of the width and height given, letting
+		# cairo lay it out to suit our surface
+		cropped_surface = self.surface.create_similar_image(
+			self._format, int(width), int(height))
 
 		# Create a Context for the cropped surface
 		cropped_context = cairo.Context(cropped_surface)
@@ -63,24 +206,32 @@ class ExtendedSurface():
 		# Paint it onto the cropped surface
 		cropped_context.paint()
 
-		# Delete our old class attributes
-		del self.surface
-		del self.context
-		del self.text
-		del self.draw
-
-		# Set the cropped surface as our surface
+		# Set the cropped surface as our surface. It has its own pixels, so
+		# any buffer from from_pil() isn't needed any more.
 		self.surface = cropped_surface
+		self._pixel_buf = None
+		self._cache_dimensions()
 
 		# With the new ImageSurface object, we need to repoint our other
-		# attributes at it
+		# attributes at it, keeping what they've already loaded
 		self.context = cairo.Context(self.surface)
-		self.text = TextSurface(self)
-		self.draw = DrawSurface(self)
+		self._rebind_helpers()
 
-		# Delete the cropped surface and its Context
-		del cropped_surface
-		del cropped_context
+	@property
+	def draw(self):
+		"""Return the DrawSurface object used to draw things."""
+		if self._draw is None:
+			self._draw = DrawSurface(self)
+		return self._draw
+
+	def _flush_batch(self):
+		"""
+		Draw the shapes waiting in a DrawSurface.batch(), if there is one.
+		Until then they only sit in our Context's path, so anything that
+		draws onto the surface itself needs to call this first.
+		"""
+		if self._draw is not None and self._draw._batch_style is not None:
+			self._draw._flush_batch()
 
 	def from_pil(self, image, alpha=1.0, image_format=cairo.FORMAT_ARGB32):
 		"""
@@ -98,40 +249,69 @@ class ExtendedSurface():
 		assert image_format in (cairo.FORMAT_RGB24, cairo.FORMAT_ARGB32),\
 			f"Unsupported pixel image_format: '{image_format}'"
 
-		# If there's no alpha channel, add in an opaque one
-		if 'A' not in image.getbands():
-			image.putalpha(int(alpha * 256.))
-
-		# Convert the PIL.Image object into a bytearray
-		arr = bytearray(image.tobytes('raw', 'BGRa'))
-
-		# Delete our old class attributes
-		del self.surface
-		del self.context
-		del self.text
-		del self.draw
-
-		# Convert the Image bytearray into a new ImageSurface
+		# Cairo expects the rows to be this far apart for this format and width
+		stride = cairo.ImageSurface.format_stride_for_width(
+			image_format, image.width)
+
+		if 'A' in image.getbands():
+			# Convert the PIL.Image object into a writable array. PIL swaps
+			# the channels and premultiplies them as it copies, and NumPy
+			# copies the result into memory cairo can draw into.
+			arr = numpy.frombuffer(
+				image.tobytes('raw', 'BGRa', stride), dtype=numpy.uint8).copy()
+		else:
+			# If there's no alpha channel, build the pixels with the alpha
+			# added in ourselves, rather than adding it to the image sent in
+			# and then converting that
+			arr = self._pixels_with_alpha(image, alpha, stride)
+
+		# Convert the Image array into a new ImageSurface. The surface draws
+		# straight into the array, so keep hold of it for as long as the
+		# surface is around.
 		self.surface = cairo.ImageSurface.create_for_data(
-			arr, image_format, image.width, image.height)
+			arr, image_format, image.width, image.height, stride)
+		self._pixel_buf = arr
+		self._cache_dimensions()
 
 		# With the new ImageSurface object, we need to repoint our other
-		# attributes at it
+		# attributes at it, keeping what they've already loaded
 		self.context = cairo.Context(self.surface)
-		self.text = TextSurface(self)
-		self.draw = DrawSurface(self)
+		self._rebind_helpers()
 
 	def get_format(self):
 		"""Return the ImageSurface attribute's format."""
-		return self.surface.get_format()
+		return self._format
 
 	def get_height(self):
 		"""Return the ImageSurface attribute's height."""
-		return self.surface.get_height()
+		return self._height
+
+	def get_pixel_array(self):
+		"""
+		Return a NumPy view of the ImageSurface attribute's pixel data, with
+		shape (height, width, 4). Pixels are premultiplied and stored in
+		cairo's native byte order (BGRA on little-endian machines).
+
+		Writing to the array changes the surface directly, so call
+		surface.mark_dirty() afterwards to let cairo know.
+		"""
+		assert self.get_format() in (cairo.FORMAT_RGB24, cairo.FORMAT_ARGB32),\
+			f"Unsupported pixel image_format: '{self.get_format()}'"
+
+		# Make sure any pending drawing has made it to the buffer
+		self.surface.flush()
+
+		# Rows may be padded, so split them by the stride before trimming
+		# them down to the width of the surface
+		width = self.get_width()
+		height = self.get_height()
+		pixels = numpy.frombuffer(self.surface.get_data(), dtype=numpy.uint8)
+		pixels = pixels.reshape(height, self.surface.get_stride())
+		return pixels[:, :width*4].reshape(height, width, 4)
 
 	def get_width(self):
 		"""Return the ImageSurface attribute's width."""
-		return self.surface.get_width()
+		return self._width
 
 	def gridlines(self, color=(0, 0, 0)):
 		"""
@@ -141,17 +321,30 @@ class ExtendedSurface():
 			color (3- or 4-tuple) -- the color of the gridlines
 				(default (0, 0, 0) (black)).
 		"""
-		self.outline(color=color)
-		self.draw.line(
-			self.get_width()/2, 0,
-			self.get_width()/2, self.get_height(),
-			color=color
-			)
-		self.draw.line(
-			0, self.get_height()/2,
-			self.get_width(), self.get_height()/2,
-			color=color
-			)
+		# Draw any shapes still waiting in a batch, so they end up under
+		# this instead of being lost or drawn over it
+		self._flush_batch()
+
+		line_width = 1
+		context = self.context
+
+		# Save the state of our Context in order to restore it at the end
+		context.save()
+
+		# Use the same line attributes the outline and lines are drawn with
+		self.set_color(color)
+		context.set_line_width(line_width)
+		context.set_line_cap(cairo.LINE_CAP_SQUARE)
+		context.set_line_join(cairo.LINE_JOIN_MITER)
+
+		# Replay the cached path and stroke everything in one go
+		context.new_path()
+		context.append_path(
+			_gridlines_path(self._width, self._height, line_width))
+		context.stroke()
+
+		# Restore the Context now that the gridlines are drawn
+		context.restore()
 
 	def outline(self, color=(0, 0, 0), line_width=1):
 		"""
@@ -177,7 +370,8 @@ class ExtendedSurface():
 			  width=None,
 			  height=None,
 			  scaling_type="absolute",
-			  rotate=0
+			  rotate=0,
+			  image_filter=cairo.FILTER_GOOD
 			  ):
 		"""
 		Paste a given cairo.ImageSurface or ExtendedSurface object at a
@@ -218,35 +412,39 @@ class ExtendedSurface():
 			rotate (float) -- how much to rotate the pasted imaged
 				clockwise, in radians, where 2*pi is one full rotation
 				(default 0).
+			image_filter (cairo.Filter) -- how to sample the image when
+				it's scaled. ExtendedSurface.FAST_PREVIEW is quicker, for
+				images that are only being previewed
+				(default cairo.FILTER_GOOD).
 		"""
 		# Make sure the parameters follow the proper formatting
 		assert scaling_type in ["absolute", "ratio"], \
 			(f"parameter 'scaling_type' cannot be '{scaling_type}', "
 			 "must be either 'absolute' or 'ratio'")
-		if isinstance(x, str):
-			assert x in ["left", "center", "right"], \
+		if type(x) is str:
+			assert x in _X_POS, \
 				(f"parameter 'x' cannot be '{x}', must be either a number "
 				 "or one of 'left', 'center', or 'right'")
-		if isinstance(y, str):
-			assert y in ["top", "center", "bottom"], \
+		if type(y) is str:
+			assert y in _Y_POS, \
 				(f"parameter 'y' cannot be '{y}', must be either a number "
 				 "or one of 'top', 'center', or 'bottom'")
 
-		# Save the state of our Context in order to restore it at the end
-		self.context.save()
+		# Draw any shapes still waiting in a batch, so they end up under
+		# this instead of being lost or drawn over it
+		self._flush_batch()
 
 		# If origin is an ExtendedSurface object, then we just want to work
 		# with its ImageSurface attribute
 		if isinstance(origin, ExtendedSurface):
 			origin = origin.surface
 
-		# Create a SurfacePattern object with which to paste the image
-		surface_pattern_origin = cairo.SurfacePattern(origin)
-
 		# Initialize the destination width and height of the image, and the
 		# scaling factors
-		dest_width = origin.get_width()
-		dest_height = origin.get_height()
+		origin_width = origin.get_width()
+		origin_height = origin.get_height()
+		dest_width = origin_width
+		dest_height = origin_height
 		scaling_width = 1
 		scaling_height = 1
 
@@ -254,36 +452,51 @@ class ExtendedSurface():
 		if not (width is None and height is None):
 			# Leave the width or height if it wasn't sent in
 			if width is None:
-				width = origin.get_width()
+				width = origin_width
 			if height is None:
-				height = origin.get_height()
+				height = origin_height
 
 			# Figure out how much to scale by based on the scaling type
 			if scaling_type == "absolute":
-				scaling_width = width / origin.get_width()
-				scaling_height = height / origin.get_height()
+				scaling_width = width / origin_width
+				scaling_height = height / origin_height
 			elif scaling_type == "ratio":
 				scaling_width = width
 				scaling_height = height
 
 			# Recalculate the width and height of the pasted image
-			dest_width = scaling_width * origin.get_width()
-			dest_height = scaling_height * origin.get_height()
-
-		# Convert the x and y coordinates, if need be
-		if x == "left":
-			x = 0
-		elif x == "center":
-			x = (self.get_width() - dest_width) / 2
-		elif x == "right":
-			x = self.get_width() - dest_width
-
-		if y == "top":
-			y = 0
-		elif y == "center":
-			y = (self.get_height() - dest_height) / 2
-		elif y == "bottom":
-			y = self.get_height() - dest_height
+			dest_width = scaling_width * origin_width
+			dest_height = scaling_height * origin_height
+
+		# Convert the x and y coordinates, if need be. Coordinates worked
+		# out from strings are rounded (with halves rounded up, so centering
+		# always leans the same way) to land the image on whole pixels,
+		# which cairo can copy it onto without resampling.
+		if type(x) is str:
+			x = math.floor(_X_POS[x](self._width, dest_width) + 0.5)
+		if type(y) is str:
+			y = math.floor(_Y_POS[y](self._height, dest_height) + 0.5)
+
+		# An image that isn't rotated or scaled, going to a whole-pixel
+		# position, can be copied straight across. Only the source needs
+		# putting back afterwards, so there's no need to save the Context.
+		if (rotate == 0 and scaling_width == 1 and scaling_height == 1
+				and float(x).is_integer() and float(y).is_integer()):
+			source = self.context.get_source()
+			self.context.set_source_surface(origin, x, y)
+			self.context.rectangle(x, y, dest_width, dest_height)
+			self.context.fill()
+			self.context.set_source(source)
+			return
+
+		# Save the state of our Context in order to restore it at the end
+		self.context.save()
+
+		# Create a SurfacePattern object with which to paste the image. The
+		# filter only matters if the image is being scaled.
+		surface_pattern_origin = cairo.SurfacePattern(origin)
+		if scaling_width != 1 or scaling_height != 1:
+			surface_pattern_origin.set_filter(image_filter)
 
 		# Move to the right place
 		self.context.translate(x, y)
@@ -308,6 +521,74 @@ class ExtendedSurface():
 		# Restore our Context back to its original state
 		self.context.restore()
 
+	@staticmethod
+	def _pixels_with_alpha(image, alpha, stride):
+		"""
+		Return an array of a PIL.Image object's pixels with a given alpha
+		added in, laid out the way cairo stores them (premultiplied BGRA,
+		with rows 'stride' bytes apart).
+
+		Keyword arguments:
+			image (PIL.Image) -- the Image to convert, without an alpha
+				channel.
+			alpha (float) -- the alpha to add, from 0.0 to 1.0.
+			stride (int) -- how many bytes apart each row should be.
+		"""
+		# Get the RGB pixels, converting the Image first if need be
+		if image.mode != "RGB":
+			image = image.convert("RGB")
+		rgb = numpy.asarray(image)
+
+		# Premultiply the colours by the alpha, rounding the same way PIL
+		# does when it premultiplies
+		alpha = min(int(alpha * 256.), 255)
+		if alpha < 255:
+			rgb = rgb.astype(numpy.uint16) * alpha + 128
+			rgb = (rgb + (rgb >> 8)) >> 8
+
+		# Fill in the pixels, reversing RGB into BGR, and the alpha
+		height, width = rgb.shape[:2]
+		arr = numpy.zeros((height, stride), dtype=numpy.uint8)
+		pixels = arr[:, :width*4].reshape(height, width, 4)
+		pixels[:, :, 2::-1] = rgb
+		pixels[:, :, 3] = alpha
+		return arr
+
+	def _rebind_helpers(self):
+		"""
+		Point the TextSurface and DrawSurface, if they've been made, at our
+		new ImageSurface and Context.
+		"""
+		if self._text is not None:
+			self._text.rebind(self)
+		if self._draw is not None:
+			self._draw.rebind(self)
+
+	def release(self):
+		"""
+		Hand our ImageSurface back to be reused by the next ExtendedSurface
+		of the same format and size. Call this when a temporary surface is
+		done with. Nothing can be drawn on or read from this ExtendedSurface
+		afterwards.
+		"""
+		# Surfaces made by from_pil() draw into a buffer of their own, so
+		# they aren't reused
+		if self._pixel_buf is None:
+			key = (self._format, self._width, self._height)
+			_SURFACE_POOL.setdefault(key, []).append(self.surface)
+			_SURFACE_POOL.move_to_end(key)
+
+			# Let go of surfaces of the least recently used sizes until the
+			# pool is back within its limit
+			while sum(map(len, _SURFACE_POOL.values())) > _SURFACE_POOL_SIZE:
+				oldest_key, oldest_pool = next(iter(_SURFACE_POOL.items()))
+				oldest_pool.pop()
+				if not oldest_pool:
+					del _SURFACE_POOL[oldest_key]
+
+		self.surface = None
+		self.context = None
+
 	def set_background(self, color=(255, 255, 255)):
 		"""
 		Set the surface background to a given color.
@@ -316,6 +597,25 @@ class ExtendedSurface():
 			color (3- or 4-tuple) -- the RGB color of the background
 				(default (255, 255, 255) (white)).
 		"""
+		# Draw any shapes still waiting in a batch, so they end up under
+		# this instead of being lost or drawn over it
+		self._flush_batch()
+
+		# An opaque color replaces every pixel, so it can be written straight
+		# into the surface's buffer as one 32-bit ARGB value per pixel,
+		# instead of being drawn
+		if (self._format in (cairo.FORMAT_RGB24, cairo.FORMAT_ARGB32)
+				and (len(color) == 3 or color[3] == 255)
+				and all(isinstance(channel, int) for channel in color)):
+			red, green, blue = color[:3]
+			self.surface.flush()
+			pixels = numpy.frombuffer(
+				self.surface.get_data(), dtype=numpy.uint32)
+			pixels = pixels.reshape(self._height, -1)[:, :self._width]
+			pixels.fill(0xff000000 | red << 16 | green << 8 | blue)
+			self.surface.mark_dirty()
+			return
+
 		self.draw.rectangle(
 			0, 0,
 			self.get_width(), self.get_height(),
@@ -331,31 +631,71 @@ class ExtendedSurface():
 		"""
 		assert len(color) in [3, 4], "parameter 'color' must be a 3- or 4-tuple"
 
-		# Grab the colours and set the alpha to opaque if it's not sent in
-		r, g, b, *a = color
-		a = a[0] if len(a) > 0 else 255
-		self.context.set_source_rgba(r/255, g/255, b/255, a/255)
+		# Grab the colours. Without an alpha, the colour is opaque.
+		if len(color) == 3:
+			r, g, b = color
+			self.context.set_source_rgb(r*_INV255, g*_INV255, b*_INV255)
+		else:
+			r, g, b, a = color
+			self.context.set_source_rgba(
+				r*_INV255, g*_INV255, b*_INV255, a*_INV255)
+
+	@property
+	def text(self):
+		"""Return the TextSurface object used to write text."""
+		if self._text is None:
+			self._text = TextSurface(self)
+		return self._text
 
 	def to_pil(self):
 		"""
 		Return the cairo.ImageSurface object, converted into a PIL.Image
 		object.
 		"""
-		# We need to convert the data from RGBA to BGRA manually.
-		# If we don't do this, then the colours switch.
-		argb_array = numpy.fromstring(
-			bytes(self.surface.get_data()), 'c').reshape(-1, 4)
-		for el in argb_array:
-			el[0:3] = el[0:3][::-1]
-		pil_data = argb_array.reshape(-1).tostring()
+		assert self.get_format() in (cairo.FORMAT_RGB24, cairo.FORMAT_ARGB32),\
+			f"Unsupported pixel image_format: '{self.get_format()}'"
+
+		# Make sure any pending drawing has made it to the buffer
+		self.surface.flush()
+
+		# PIL can read cairo's premultiplied BGRA pixels straight from the
+		# surface, swapping the channels and undoing the premultiplication
+		# as it copies them, the opposite of what from_pil() does. RGB24
+		# surfaces have no alpha, so their fourth byte is skipped instead.
+		size = (self.get_width(), self.get_height())
+		stride = self.surface.get_stride()
+		if self.get_format() == cairo.FORMAT_RGB24:
+			return Image.frombuffer(
+				"RGB", size, self.surface.get_data(), "raw", "BGRX", stride, 1
+				).convert("RGBA")
 
 		# Return the PIL.Image object representing our ImageSurface
 		return Image.frombuffer(
-			"RGBA",
-			(self.surface.get_width(), self.surface.get_height()),
-			pil_data,
-			"raw", "RGBA", 0, 1
-			)
+			"RGBA", size, self.surface.get_data(), "raw", "BGRa", stride, 1)
+
+	def write_to(self, target_paths, dpi=300):
+		"""
+		Write our Surface to one or more files, choosing the file type from
+		each path's extension. Every file is written straight from the same
+		ImageSurface, so nothing is drawn more than once.
+
+		Keyword arguments:
+			target_paths (list) -- the filepaths to save to, each ending
+				in either ".png" or ".pdf".
+			dpi (float) -- the DPI of the image, used for PDF files
+				(default 300).
+		"""
+		writers = {
+			".png": self.write_to_png,
+			".pdf": lambda target_path: self.write_to_pdf(target_path, dpi),
+			}
+
+		for target_path in target_paths:
+			extension = os.path.splitext(target_path)[1].lower()
+			assert extension in writers, \
+				(f"cannot write to '{target_path}', file extension must be "
+				 "either '.png' or '.pdf'")
+			writers[extension](target_path)
 
 	def write_to_pdf(self, target_path, dpi=300):
 		"""
@@ -371,28 +711,35 @@ class ExtendedSurface():
 
 		# Create the PDFSurface object at the proper dimensions
 		pdf_surface = cairo.PDFSurface(target_path,
-									   self.surface.get_width() * pdf_scale,
-									   self.surface.get_height() * pdf_scale)
+									   self._width * pdf_scale,
+									   self._height * pdf_scale)
 		pdf_context = cairo.Context(pdf_surface)
 
-		# Paint our Surface onto the PDFSurface
-		pdf_context.save()
-		try:
-			pdf_context.identity_matrix()
+		# Paint our Surface onto the PDFSurface. The Context is brand new, so
+		# it has nothing to save or reset, and at 72 DPI it doesn't need
+		# scaling either.
+		if pdf_scale != 1:
 			pdf_context.scale(pdf_scale, pdf_scale)
-			pdf_context.set_source_surface(self.surface)
-			pdf_context.paint()
-		finally:
-			pdf_context.restore()
+		pdf_context.set_source_surface(self.surface)
+		pdf_context.paint()
 
 		# Save the PDF file
 		pdf_context.show_page()
 
-	def write_to_png(self, target_path):
+	def write_to_png(self, target_path, compression=None):
 		"""
 		Write our surface object to a PNG file.
 
 		Keyword arguments:
 			target_path (str) -- the filepath of the PNG file to save to.
+			compression (int) -- the zlib compression level, from 0 (none,
+				fastest) to 9 (smallest file). If left as None, cairo
+				writes the file with its own settings (default None).
 		"""
+		# Cairo can't be told how hard to compress, so go through PIL if a
+		# compression level is asked for
+		if compression is not None:
+			self.to_pil().save(target_path, "PNG", compress_level=compression)
+			return
+
 		self.surface.write_to_png(target_path)
@@ -27,6 +27,12 @@ import cairo
 
 FONT_DIR = os.path.join("fonts")
 
+# Cairo font faces that have already been loaded, keyed by font path.
+# Loading a face means opening and parsing the font file with FreeType, so
+# each font file is only loaded once. The font size is applied separately,
+# so one face serves every size.
+_FONT_FACES = {}
+
 class TextSurface():
 	"""Write a block of text according to provided attributes."""
 	def __init__(self, calling_surface):
@@ -96,6 +102,17 @@ class TextSurface():
 		self.text_width = None
 		self.text_height = None
 
+	def rebind(self, calling_surface):
+		"""
+		Point the TextSurface at a surface whose ImageSurface has been
+		replaced, keeping the fonts it has already loaded.
+
+		Keyword arguments:
+			calling_surface (ExtendedSurface) -- the surface onto which
+				text will be written.
+		"""
+		self.calling_surface = calling_surface
+
 	def write(self, text, x, y, font, **kwargs):
 		"""
 		Write text at given coordinates, with given attributes. Return
@@ -221,7 +238,10 @@ class TextSurface():
 			self.exterior_extended_surface.get_height()
 			]
 
-		# Delete the now-unnecessary objects to free up memory
+		# Hand the temporary surfaces back to be reused by the next text
+		# written, and delete the now-unnecessary objects to free up memory
+		self.interior_extended_surface.release()
+		self.exterior_extended_surface.release()
 		del self.interior_extended_surface
 		del self.exterior_extended_surface
 		del self.font_face
@@ -571,7 +591,9 @@ class TextSurface():
 		self.break_up_lines = kwargs.get("break_up_lines", True)
 		self.color = kwargs.get("color", (0, 0, 0))
 		self.font = self._get_font(font)
-		self.font_face = self._create_font_face()
+		self.font_face = _FONT_FACES.get(self.font)
+		if self.font_face is None:
+			self.font_face = _FONT_FACES[self.font] = self._create_font_face()
 		self.font_size = kwargs.get("font_size", "fill")
 		self.justify_last_line = kwargs.get("justify_last_line", False)
 		self.line_spacing = kwargs.get("line_spacing", 1.0)
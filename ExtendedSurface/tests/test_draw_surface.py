@@ -0,0 +1,155 @@
+"""Tests for drawing on an ExtendedSurface with its DrawSurface."""
+import unittest
+
+import cairo
+import numpy
+
+from src.ExtendedSurface import ExtendedSurface
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+def pixels(es):
+	"""
+	Return a copy of an ExtendedSurface object's pixels, as a NumPy array.
+
+	Keyword arguments:
+		es (ExtendedSurface) -- the surface to read.
+	"""
+	return es.get_pixel_array().copy()
+
+class TestBatch(unittest.TestCase):
+	"""Tests for DrawSurface.batch()."""
+
+	def test_batch_style_applies_to_line(self):
+		"""A line drawn inside a batch uses the batch's attributes."""
+		batched = ExtendedSurface(20, 20)
+		with batched.draw.batch(color=RED):
+			batched.draw.line(0, 10, 20, 10)
+
+		drawn = ExtendedSurface(20, 20)
+		drawn.draw.line(0, 10, 20, 10, color=RED)
+
+		self.assertTrue((pixels(batched) == pixels(drawn)).all())
+
+	def test_paste_inside_batch(self):
+		"""A rectangle batched before a paste is drawn under the paste."""
+		image = ExtendedSurface(5, 5)
+		image.set_background(BLUE)
+
+		batched = ExtendedSurface(20, 20)
+		with batched.draw.batch(color=RED):
+			batched.draw.rectangle(0, 0, 10, 10)
+			batched.paste(image, 8, 8)
+
+		drawn = ExtendedSurface(20, 20)
+		drawn.draw.rectangle(0, 0, 10, 10, color=RED)
+		drawn.paste(image, 8, 8)
+
+		self.assertTrue((pixels(batched) == pixels(drawn)).all())
+
+class TestStamps(unittest.TestCase):
+	"""
+	Tests that dots and rounded rectangles pasted from cached images look
+	the same as ones drawn straight onto the surface.
+	"""
+
+	def assert_same_pixels(self, stamped, drawn, tolerance=0):
+		"""
+		Check that two surfaces' pixels differ by no more than a tolerance.
+
+		Keyword arguments:
+			stamped (ExtendedSurface) -- the surface drawn on normally.
+			drawn (ExtendedSurface) -- the surface drawn on directly.
+			tolerance (int) -- how far apart any byte can be (default 0).
+		"""
+		difference = numpy.abs(
+			pixels(stamped).astype(numpy.int16) - pixels(drawn))
+		self.assertLessEqual(difference.max(), tolerance)
+
+	def compare(self, shape, setup=None, tolerance=0):
+		"""
+		Draw a shape on one surface normally and on another directly, and
+		check they come out the same.
+
+		Keyword arguments:
+			shape (function) -- draws the shape, given a DrawSurface and
+				whether to draw it directly.
+			setup (function) -- prepares each surface before the shape is
+				drawn (default None).
+			tolerance (int) -- how far apart any byte can be (default 0).
+		"""
+		stamped = ExtendedSurface(40, 40)
+		drawn = ExtendedSurface(40, 40)
+		if setup is not None:
+			setup(stamped)
+			setup(drawn)
+
+		shape(stamped.draw, False)
+		shape(drawn.draw, True)
+		self.assert_same_pixels(stamped, drawn, tolerance)
+
+	def test_dot(self):
+		"""Dots at whole and quarter pixels match dots drawn directly."""
+		for x, y in ((10, 10), (10.25, 10.5), (10.75, 11)):
+			for outline_color in (RED, BLUE):
+				with self.subTest(x=x, y=y, outline_color=outline_color):
+					self.compare(
+						lambda draw, direct:
+							(draw._draw_dot if direct else draw.dot)(
+								x, y, 5, color=RED,
+								outline_color=outline_color))
+
+	def test_rounded_rectangle(self):
+		"""
+		Rounded rectangles at whole and half pixels match rounded
+		rectangles drawn directly.
+		"""
+		for outline in (1, 2, 3):
+			with self.subTest(outline=outline):
+				self.compare(
+					lambda draw, direct: (
+						draw._draw_rounded_rectangle if direct
+						else draw.rounded_rectangle)(
+							5, 5, 20, 15, 4, color=RED, outline=outline,
+							outline_color=BLUE))
+
+	def test_over_background(self):
+		"""
+		Shapes pasted over a background match shapes drawn directly, give
+		or take rounding, since the shape's fill and outline are combined
+		before being composited instead of after.
+		"""
+		self.compare(
+			lambda draw, direct: (draw._draw_dot if direct else draw.dot)(
+				10, 10, 5, color=(255, 0, 0, 128), outline_color=BLUE),
+			setup=lambda es: es.set_background(),
+			tolerance=1)
+
+	def test_transformed_context(self):
+		"""Shapes on a scaled or rotated Context are drawn as paths."""
+		for transform in (
+				lambda context: context.scale(2, 2),
+				lambda context: context.rotate(0.5),
+				lambda context: context.translate(0.5, 0)):
+			with self.subTest(transform=transform):
+				self.compare(
+					lambda draw, direct:
+						(draw._draw_dot if direct else draw.dot)(
+							10, 10, 5, color=RED),
+					setup=lambda es: transform(es.context))
+
+	def test_operator(self):
+		"""Shapes drawn with another operator only change their own pixels."""
+		def setup(es):
+			"""Fill the surface with white, then draw with OPERATOR_SOURCE."""
+			es.set_background()
+			es.context.set_operator(cairo.OPERATOR_SOURCE)
+
+		self.compare(
+			lambda draw, direct: (draw._draw_dot if direct else draw.dot)(
+				10, 10, 5, color=RED),
+			setup=setup)
+
+if __name__ == "__main__":
+	unittest.main()